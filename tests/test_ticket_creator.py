@@ -0,0 +1,203 @@
+import os
+import sys
+import base64
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+# ticket_creator validates its configuration at import time
+os.environ.setdefault("FRESHSERVICE_DOMAIN", "example.freshservice.com")
+os.environ.setdefault("API_KEY", "test-api-key-0123456789")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiohttp import web
+
+import ticket_creator
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(ticket_creator, "RETRY_DELAY", 0)
+    # local_api points BASE_URL at the test server, restore it afterwards
+    monkeypatch.setattr(ticket_creator, "BASE_URL", ticket_creator.BASE_URL)
+
+
+@asynccontextmanager
+async def local_api(*routes):
+    """Serve (method, path, handler) routes locally and open a session against them."""
+    app = web.Application(client_max_size=10 * 1024 * 1024)
+    for method, path, handler in routes:
+        app.router.add_route(method, path, handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    try:
+        ticket_creator.BASE_URL = f"http://127.0.0.1:{port}"
+        async with ticket_creator.create_session() as session:
+            yield session
+    finally:
+        await runner.cleanup()
+
+
+def create_ticket(session, attachments=None):
+    return ticket_creator.create_ticket_async(
+        session,
+        ticket_creator.ProgressDisplay(),
+        first_name="Ada",
+        last_name="Lovelace",
+        email="ada@example.com",
+        description="Printer on fire",
+        category="Hardware",
+        sub_category="",
+        item_category="",
+        priority=1,
+        workspace_id=1,
+        attachments=attachments
+    )
+
+
+def test_retry_after_429_resends_full_attachment(tmp_path):
+    payload = os.urandom(200000)
+    attachment = tmp_path / "screenshot.png"
+    attachment.write_bytes(payload)
+    received = []
+
+    async def tickets(request):
+        form = await request.post()
+        received.append({
+            "attachment": form["attachments[]"].file.read(),
+            "chunked": "chunked" in request.headers.get("Transfer-Encoding", ""),
+            "content_length": request.content_length,
+            "authorization": request.headers.get("Authorization"),
+        })
+        if len(received) == 1:
+            return web.json_response({}, status=429, headers={"Retry-After": "0"})
+        return web.json_response({"ticket": {"id": 1}})
+
+    async def run():
+        async with local_api(("POST", "/tickets", tickets)) as session:
+            return await create_ticket(session, attachments=[str(attachment)])
+
+    result = asyncio.run(run())
+
+    assert result == {"ticket": {"id": 1}}
+    assert len(received) == 2
+    for attempt in received:
+        assert attempt["attachment"] == payload
+        assert not attempt["chunked"]
+        assert attempt["content_length"]
+        assert attempt["authorization"] == ticket_creator.API_AUTHORIZATION
+
+
+def test_get_server_error_is_retried_max_retries_times():
+    calls = []
+
+    async def workspaces(request):
+        calls.append(request.method)
+        return web.json_response({}, status=500)
+
+    async def run():
+        async with local_api(("GET", "/workspaces", workspaces)) as session:
+            return await ticket_creator.make_request(session, 'GET', f"{ticket_creator.BASE_URL}/workspaces")
+
+    with pytest.raises(ticket_creator.APIError, match="500"):
+        asyncio.run(run())
+    assert len(calls) == ticket_creator.MAX_RETRIES
+
+
+def test_ticket_post_server_error_is_sent_once():
+    # A 500 may still have created the ticket, retrying would duplicate it
+    calls = []
+
+    async def tickets(request):
+        calls.append(await request.json())
+        return web.json_response({}, status=500)
+
+    async def run():
+        async with local_api(("POST", "/tickets", tickets)) as session:
+            return await create_ticket(session)
+
+    with pytest.raises(ticket_creator.APIError, match="500"):
+        asyncio.run(run())
+    assert len(calls) == 1
+
+
+
+def user_routes(requesters, agents):
+    """Routes answering /requesters and /agents with the given users, or a status code to fail with."""
+    def endpoint(key, users):
+        async def handler(request):
+            if isinstance(users, int):
+                return web.json_response({}, status=users)
+            return web.json_response({key: users})
+        return handler
+
+    return (
+        ("GET", "/requesters", endpoint("requesters", requesters)),
+        ("GET", "/agents", endpoint("agents", agents)),
+    )
+
+
+def lookup(requesters, agents):
+    async def run():
+        async with local_api(*user_routes(requesters, agents)) as session:
+            return await ticket_creator.lookup_user(session, "ada@example.com")
+    return asyncio.run(run())
+
+
+REQUESTER = {"id": 1, "first_name": "Ada", "last_name": "Requester"}
+AGENT = {"id": 2, "first_name": "Ada", "last_name": "Agent"}
+
+
+def test_lookup_user_falls_back_to_agent():
+    assert lookup([], [AGENT])["id"] == 2
+
+
+def test_lookup_user_requester_survives_failing_agents_call():
+    assert lookup([REQUESTER], 403)["id"] == 1
+
+
+def test_lookup_user_prefers_requester_over_agent():
+    assert lookup([REQUESTER], [AGENT])["id"] == 1
+
+
+def test_get_user_info_caches_lookups_on_disk(tmp_path, monkeypatch):
+    monkeypatch.setattr(ticket_creator, "CACHE_DIR", str(tmp_path))
+    requester = dict(REQUESTER)
+    calls = []
+
+    async def requesters(request):
+        calls.append(request.path)
+        return web.json_response({"requesters": [requester]})
+
+    async def agents(request):
+        calls.append(request.path)
+        return web.json_response({"agents": []})
+
+    async def run():
+        routes = (("GET", "/requesters", requesters), ("GET", "/agents", agents))
+        async with local_api(*routes) as session:
+            first = await ticket_creator.get_user_info(session, "ada@example.com")
+            api_calls = len(calls)
+            cached = await ticket_creator.get_user_info(session, "ada@example.com")
+            assert len(calls) == api_calls, "cached lookup must not hit the API"
+
+            requester["last_name"] = "Renamed"
+            refreshed = await ticket_creator.get_user_info(session, "ada@example.com", use_cache=False)
+            assert len(calls) == 2 * api_calls
+            return first, cached, refreshed
+
+    first, cached, refreshed = asyncio.run(run())
+
+    assert cached == first
+    assert refreshed["last_name"] == "Renamed"
+    cache_file = tmp_path / f"{ticket_creator.FRESHSERVICE_DOMAIN}_users.json"
+    assert ticket_creator.read_cache(str(cache_file))["ada@example.com"]["last_name"] == "Renamed"
+
+def test_authorization_header_encodes_api_key():
+    expected = base64.b64encode(f"{ticket_creator.API_KEY}:X".encode()).decode()
+    assert ticket_creator.DEFAULT_HEADERS["Authorization"] == f"Basic {expected}"
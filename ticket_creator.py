@@ -1,28 +1,51 @@
 import os
 import sys
+import argparse
+import re
 import json
+import base64
+import time
+import queue
+import atexit
+import random
+import tempfile
 import logging
 import asyncio
+import threading
 import aiohttp
-from typing import List, Dict, Any, Optional, Union
+import orjson
+from typing import Awaitable, Callable, List, Dict, Any, Optional, Tuple, Union
 from dataclasses import dataclass
-from dotenv import load_dotenv
-from pick import pick
+from contextlib import contextmanager
 from rich import print
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from email_validator import validate_email
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 from urllib.parse import quote
 
+try:
+    import uvloop
+except ImportError:  # optional, not available on Windows
+    uvloop = None
+
+try:
+    import termios
+except ImportError:  # Windows
+    termios = None
+
 # Constants
 API_VERSION = "v2"
 CONTENT_TYPE = "application/json"
 MAX_RETRIES = 3
 RETRY_DELAY = 2
+MAX_CONCURRENT_REQUESTS = 10
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "freshservice")
+TICKET_FIELDS_TTL = 3600  # seconds
+EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
 
-# Load environment variables
-load_dotenv()
+# Load environment variables, skipping the .env parse when they are already set
+if os.getenv("FRESHSERVICE_DOMAIN") is None or os.getenv("API_KEY") is None:
+    from dotenv import load_dotenv
+    load_dotenv()
 
 # Configuration validation
 FRESHSERVICE_DOMAIN = os.getenv("FRESHSERVICE_DOMAIN")
@@ -33,18 +56,33 @@ if not FRESHSERVICE_DOMAIN or not API_KEY:
     sys.exit(1)
 
 BASE_URL = f"https://{FRESHSERVICE_DOMAIN}/api/{API_VERSION}"
+# Freshservice takes the API key as the basic auth user with any password
+API_AUTHORIZATION = "Basic " + base64.b64encode(f"{API_KEY}:X".encode()).decode()
+DEFAULT_HEADERS = {
+    "Accept": CONTENT_TYPE,
+    "Authorization": API_AUTHORIZATION,
+    "Connection": "keep-alive"
+}
 
 # Update the logging configuration
+# Records go through a queue so the event loop never blocks on file writes;
+# the listener thread does the actual disk I/O
+log_queue = queue.Queue(-1)
+log_listener = QueueListener(
+    log_queue,
+    RotatingFileHandler(
+        "freshservice.log",
+        maxBytes=1024*1024,  # 1MB
+        backupCount=5
+    )
+)
+log_listener.start()
+atexit.register(log_listener.stop)
+
 logging.basicConfig(
     level=logging.DEBUG,  # Set to DEBUG to capture detailed logs
     format="%(asctime)s %(levelname)s:%(message)s",
-    handlers=[
-        RotatingFileHandler(
-            "freshservice.log",
-            maxBytes=1024*1024,  # 1MB
-            backupCount=5
-        )
-    ]
+    handlers=[QueueHandler(log_queue)]
 )
 
 console = Console()
@@ -57,75 +95,172 @@ class Workspace:
 class APIError(Exception):
     pass
 
-async def make_request(session: aiohttp.ClientSession, method: str, url: str, **kwargs) -> Dict:
-    auth = aiohttp.BasicAuth(API_KEY, 'X')
-    if 'headers' not in kwargs:
-        kwargs['headers'] = {"Content-Type": CONTENT_TYPE, "Accept": CONTENT_TYPE}
-    kwargs['auth'] = auth
+class ProgressDisplay:
+    """One shared rich Progress for the run, built the first time a spinner is shown.
 
-    for attempt in range(MAX_RETRIES):
+    The display is only live while at least one spinner is running, so it never
+    draws over an input() prompt or the pick menu.
+    """
+
+    def __init__(self):
+        self._progress = None
+
+    @contextmanager
+    def spinner(self, description: str):
+        """Show a spinner task on the shared display while the block runs."""
+        if self._progress is None:
+            from rich.progress import Progress, SpinnerColumn, TextColumn
+            self._progress = Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"))
+        progress = self._progress
+
+        task_id = progress.add_task(description=description, total=None)
+        if len(progress.task_ids) == 1:
+            progress.start()
         try:
-            async with session.request(method, url, **kwargs) as response:
-                response_text = await response.text()
-                logging.debug(f"API Response ({response.status}): {response_text}")
-                
-                if response.status == 404:
-                    logging.error(f"API Error {response.status}: {response_text}")
-                    raise APIError("Resource not found. Please verify your Freshservice domain and endpoint configuration.")
-                elif response.status == 401:
-                    logging.error(f"API Error {response.status}: {response_text}")
-                    raise APIError("Authentication failed. Please check your API key.")
-                elif response.status >= 400:
-                    logging.error(f"API Error {response.status}: {response_text}")
-                    raise APIError(f"API Error {response.status}: {response_text}")
+            yield
+        finally:
+            progress.remove_task(task_id)
+            if not progress.task_ids:
+                progress.stop()
+
+def create_session() -> aiohttp.ClientSession:
+    """Create the shared session used for every API call in a run.
+
+    Auth and default headers live on the session so each request reuses the
+    same pooled keep-alive connections instead of a fresh TCP+TLS handshake.
+    Content-Type is left to aiohttp so multipart uploads get their boundary.
+
+    aiohttp only speaks HTTP/1.1, so concurrent requests (the startup gather)
+    each hold their own pooled connection; limit_per_host bounds how many.
+    """
+    return aiohttp.ClientSession(
+        headers=DEFAULT_HEADERS,
+        # aiohttp expects str from json_serialize, orjson returns bytes
+        json_serialize=lambda obj: orjson.dumps(obj).decode(),
+        # Users can sit on a prompt for a while, keep idle sockets around long
+        # enough that the next request still finds a warm TLS connection
+        connector=aiohttp.TCPConnector(
+            limit=20,
+            limit_per_host=10,
+            keepalive_timeout=120,
+            ttl_dns_cache=600,
+            force_close=False
+        )
+    )
 
-                try:
-                    return await response.json()
-                except json.JSONDecodeError:
-                    logging.error(f"Failed to parse JSON response: {response_text}")
-                    raise APIError("Invalid JSON response from API")
+_request_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+def retry_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """Exponential backoff with jitter, never shorter than the server's Retry-After."""
+    delay = RETRY_DELAY * 2 ** attempt + random.uniform(0, RETRY_DELAY)
+    try:
+        return max(float(retry_after), delay) if retry_after else delay
+    except ValueError:  # HTTP-date form, fall back to our own backoff
+        return delay
+
+async def make_request(
+    session: aiohttp.ClientSession,
+    method: str,
+    url: str,
+    body_factory: Optional[Callable[[], Awaitable[Dict[str, Any]]]] = None,
+    **kwargs
+) -> Dict:
+    """Send a request with retries and return the parsed JSON body.
+
+    Single-use bodies (multipart forms, streamed files) must come from
+    body_factory, a coroutine returning extra request kwargs, awaited again
+    before every attempt so a retry never sends a drained payload.
+    """
+    for attempt in range(MAX_RETRIES):
+        retry_after = None
+        last_attempt = attempt == MAX_RETRIES - 1
+        request_kwargs = {**kwargs, **(await body_factory())} if body_factory else kwargs
+        try:
+            async with _request_semaphore:
+                async with session.request(method, url, **request_kwargs) as response:
+                    status = response.status
+                    # Rate limits are always safe to retry; server errors only for reads,
+                    # so a failed POST never risks creating the ticket twice
+                    retryable = status == 429 or (status >= 500 and method == 'GET')
+                    if retryable and not last_attempt:
+                        retry_after = response.headers.get('Retry-After')
+                        logging.warning(f"API returned {status}, retrying (attempt {attempt + 1}/{MAX_RETRIES})")
+                    elif status >= 400:
+                        # Only decode the body as text when it is going into an error
+                        response_text = await response.text()
+                        logging.error(f"API Error {status}: {response_text}")
+                        if status == 404:
+                            raise APIError("Resource not found. Please verify your Freshservice domain and endpoint configuration.")
+                        elif status == 401:
+                            raise APIError("Authentication failed. Please check your API key.")
+                        raise APIError(f"API Error {status}: {response_text}")
+                    else:
+                        # Parse the raw bytes once; response.json() would decode to str first
+                        body = await response.read()
+                        if logging.getLogger().isEnabledFor(logging.DEBUG):
+                            logging.debug(f"API Response ({status}): {body.decode('utf-8', 'replace')}")
+
+                        try:
+                            return orjson.loads(body)
+                        except orjson.JSONDecodeError:
+                            logging.error(f"Failed to parse JSON response: {body.decode('utf-8', 'replace')}")
+                            raise APIError("Invalid JSON response from API")
 
         except aiohttp.ClientError as e:
-            if attempt == MAX_RETRIES - 1:
+            if last_attempt:
                 raise APIError(f"Request failed after {MAX_RETRIES} attempts: {str(e)}")
-            await asyncio.sleep(RETRY_DELAY * (attempt + 1))
 
-async def get_workspaces() -> List[Workspace]:
+        await asyncio.sleep(retry_delay(attempt, retry_after))
+
+async def get_workspaces(session: aiohttp.ClientSession) -> List[Workspace]:
     url = f"{BASE_URL}/workspaces"
 
-    async with aiohttp.ClientSession() as session:
-        try:
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}")
-            ) as progress:
-                progress.add_task(description="Fetching workspaces...", total=None)
-                data = await make_request(session, 'GET', url)
-
-                if not data or 'workspaces' not in data:
-                    raise APIError("No workspaces data found in response")
-
-                workspaces = data['workspaces']
-                return [Workspace(id=ws['id'], name=ws['name']) for ws in workspaces]
-        except Exception as e:
-            logging.error(f"Failed to fetch workspaces: {e}")
-            raise APIError(f"Failed to fetch workspaces: {str(e)}")
+    try:
+        data = await make_request(session, 'GET', url)
+
+        if not data or 'workspaces' not in data:
+            raise APIError("No workspaces data found in response")
+
+        workspaces = data['workspaces']
+        return [Workspace(id=ws['id'], name=ws['name']) for ws in workspaces]
+    except Exception as e:
+        logging.error(f"Failed to fetch workspaces: {e}")
+        raise APIError(f"Failed to fetch workspaces: {str(e)}")
+
+def read_cache(path: str, ttl: Optional[float] = None) -> Optional[Any]:
+    """Return the JSON stored at path, or None if it is missing, stale or unreadable."""
+    try:
+        if ttl is not None and time.time() - os.path.getmtime(path) >= ttl:
+            return None
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+def write_cache(path: str, data: Any) -> None:
+    """Atomically write data as JSON to path so readers never see a partial file."""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, 'wb') as f:
+            f.write(orjson.dumps(data))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logging.warning(f"Failed to write cache {path}: {e}")
+
+async def fetch_ticket_fields(session: aiohttp.ClientSession, use_cache: bool = True) -> List[Dict[str, Any]]:
+    cache_path = os.path.join(CACHE_DIR, f"{FRESHSERVICE_DOMAIN}_ticket_fields.json")
+    cached = read_cache(cache_path, TICKET_FIELDS_TTL) if use_cache else None
+    if cached is not None:
+        logging.debug(f"Using cached ticket fields from {cache_path}")
+        return cached
 
-async def fetch_ticket_fields() -> List[Dict[str, Any]]:
     url = f"{BASE_URL}/ticket_fields"
-    auth = aiohttp.BasicAuth(API_KEY, 'X')
-    headers = {
-        "Content-Type": "application/json",
-        "Accept": "application/json"
-    }
 
-    async with aiohttp.ClientSession(auth=auth) as session:
-        data = await make_request(session, 'GET', url, headers=headers)
-        return data.get('ticket_fields', [])
-    
-    with open('ticket_fields_debug.json', 'w') as f:
-        json.dump(data, f, indent=4)
-    return data.get('ticket_fields', [])
+    data = await make_request(session, 'GET', url)
+    ticket_fields = data.get('ticket_fields', [])
+    write_cache(cache_path, ticket_fields)
+    return ticket_fields
 
 def extract_choices(ticket_fields: List[Dict[str, Any]]) -> Dict[str, Any]:
     for field in ticket_fields:
@@ -133,37 +268,58 @@ def extract_choices(ticket_fields: List[Dict[str, Any]]) -> Dict[str, Any]:
             return field.get('choices', {})
     return {}
 
-def build_category_structure(choices_data: Dict[str, Dict]) -> Dict[str, Any]:
-    # Directly use the nested structure from choices_data
-    return choices_data
-
-def traverse_category(category_tree: Dict[str, Any]) -> Dict[str, Any]:
+def build_category_index(choices_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten the nested category choices into ready-to-pick option tuples.
+
+    Returns {"categories": (...), "subs": {cat: (...)}, "items": {(cat, sub): (...)}},
+    with empty levels left out so traversal is plain dict lookups.
+    """
+    subs = {}
+    items = {}
+    for category, sub_tree in choices_data.items():
+        if not sub_tree or not isinstance(sub_tree, dict):
+            continue
+        subs[category] = tuple(sub_tree)
+        for sub_category, item_list in sub_tree.items():
+            if item_list and isinstance(item_list, list):
+                items[(category, sub_category)] = tuple(item_list)
+
+    return {"categories": tuple(choices_data), "subs": subs, "items": items}
+
+async def traverse_category(category_index: Dict[str, Any]) -> Dict[str, Any]:
     path = {}
     
     # Select category
-    category_options = list(category_tree.keys())
-    selection, _ = pick(category_options, "Select category:")
-    selected_category_name = selection
-    selected_category = category_tree[selected_category_name]
+    selected_category_name, _ = await apick(category_index['categories'], "Select category:")
     path['category_name'] = selected_category_name
 
     # Check for sub_categories
-    if selected_category and isinstance(selected_category, dict):
-        sub_category_options = list(selected_category.keys())
-        if sub_category_options:
-            selection, _ = pick(sub_category_options, f"Select sub-category for '{selected_category_name}':")
-            selected_sub_category_name = selection
-            selected_sub_category = selected_category[selected_sub_category_name]
-            path['sub_category_name'] = selected_sub_category_name
-
-            # Check for item_categories
-            if selected_sub_category and isinstance(selected_sub_category, list) and selected_sub_category:
-                selection, _ = pick(selected_sub_category, f"Select item category for '{selected_sub_category_name}':")
-                path['item_category_name'] = selection
+    sub_category_options = category_index['subs'].get(selected_category_name)
+    if sub_category_options:
+        selected_sub_category_name, _ = await apick(sub_category_options, f"Select sub-category for '{selected_category_name}':")
+        path['sub_category_name'] = selected_sub_category_name
+
+        # Check for item_categories
+        item_category_options = category_index['items'].get((selected_category_name, selected_sub_category_name))
+        if item_category_options:
+            selection, _ = await apick(item_category_options, f"Select item category for '{selected_sub_category_name}':")
+            path['item_category_name'] = selection
 
     return path
 
+def classify_attachments(file_paths: List[str]) -> Tuple[List[str], List[str]]:
+    """Split paths into (present, missing) so all the stat calls share one thread hop."""
+    present, missing = [], []
+    for file_path in file_paths:
+        if os.path.isfile(file_path):
+            present.append(file_path)
+        else:
+            missing.append(file_path)
+    return present, missing
+
 async def create_ticket_async(
+    session: aiohttp.ClientSession,
+    progress: ProgressDisplay,
     first_name: str,
     last_name: str,
     email: str,
@@ -190,79 +346,179 @@ async def create_ticket_async(
         "source": 2  # 2 represents "Portal" source
     }
 
-    logging.debug(f"Ticket data being sent: {json.dumps(ticket_data, indent=2)}")
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        logging.debug(f"Ticket data being sent: {orjson.dumps(ticket_data, option=orjson.OPT_INDENT_2).decode()}")
 
-    auth = aiohttp.BasicAuth(API_KEY, 'X')
     url = f"{BASE_URL}/tickets"
 
-    async with aiohttp.ClientSession(auth=auth) as session:
-        try:
-            with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}")) as progress:
-                progress.add_task(description="Creating ticket...", total=None)
-
-                if attachments:
+    try:
+        with progress.spinner(f"Creating ticket for {email}..."):
+            if attachments:
+                present, missing = await asyncio.to_thread(classify_attachments, attachments)
+                if missing:
+                    console.print(f"[yellow]Warning: Attachments not found: {', '.join(missing)}[/yellow]")
+
+                opened = []
+
+                # A multipart body is consumed (and its files closed) by sending it,
+                # so build a fresh one with freshly opened files for every attempt.
+                # aiohttp streams file objects in 64KB chunks on its executor and
+                # sends a Content-Length, so nothing is buffered in memory.
+                async def build_form() -> Dict[str, Any]:
                     data = aiohttp.FormData()
-                    data.add_field('input_data', json.dumps(ticket_data))
-                    for file_path in attachments:
-                        if os.path.isfile(file_path):
-                            data.add_field('attachments[]',
-                                        open(file_path, 'rb'),
-                                        filename=os.path.basename(file_path))
-                        else:
-                            console.print(f"[yellow]Warning: Attachment {file_path} not found.[/yellow]")
-                    return await make_request(session, 'POST', url, data=data)
-                else:
-                    headers = {'Content-Type': 'application/json'}
-                    return await make_request(session, 'POST', url, headers=headers, json=ticket_data)
+                    data.add_field('input_data', orjson.dumps(ticket_data).decode())
+                    for file_path in present:
+                        f = await asyncio.to_thread(open, file_path, 'rb')
+                        opened.append(f)
+                        data.add_field('attachments[]',
+                                    f,
+                                    filename=os.path.basename(file_path),
+                                    content_type='application/octet-stream')
+                    return {'data': data}
 
-        except Exception as e:
-            logging.error(f"Failed to create ticket: {e}")
-            raise
+                try:
+                    return await make_request(session, 'POST', url, body_factory=build_form)
+                finally:
+                    # Covers attempts that failed before aiohttp sent (and closed) them
+                    for f in opened:
+                        f.close()
+            else:
+                return await make_request(session, 'POST', url, json=ticket_data)
 
-def validate_user_input(prompt: str, validation_func) -> Any:
+    except Exception as e:
+        logging.error(f"Failed to create ticket: {e}")
+        raise
+
+async def create_tickets_bulk(
+    session: aiohttp.ClientSession,
+    progress: ProgressDisplay,
+    tickets: List[Dict[str, Any]],
+    concurrency: int = 8
+) -> List[Union[Dict[str, Any], BaseException]]:
+    """Create many tickets concurrently over the shared session.
+
+    Each entry in tickets holds the keyword arguments of create_ticket_async.
+    Results come back in the same order; a failed ticket yields its exception
+    instead of aborting the rest of the batch.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def create_one(ticket: Dict[str, Any]) -> Dict[str, Any]:
+        async with semaphore:
+            return await create_ticket_async(session, progress, **ticket)
+
+    return await asyncio.gather(*(create_one(ticket) for ticket in tickets), return_exceptions=True)
+
+def run_in_thread(func, *args, **kwargs) -> asyncio.Future:
+    """Run a blocking call in a daemon thread so in-flight requests keep progressing.
+
+    asyncio.to_thread is avoided on purpose: its executor is joined when the
+    loop shuts down, so Ctrl-C would hang until the pending prompt returned.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def settle(setter, value):
+        if not future.done():
+            setter(value)
+
+    def runner():
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as e:
+            loop.call_soon_threadsafe(settle, future.set_exception, e)
+        else:
+            loop.call_soon_threadsafe(settle, future.set_result, result)
+
+    threading.Thread(target=runner, daemon=True).start()
+    return future
+
+def save_terminal() -> Optional[list]:
+    """Snapshot the tty modes so they can be restored if a prompt thread is abandoned."""
+    if termios is None or not sys.stdin.isatty():
+        return None
+    return termios.tcgetattr(sys.stdin.fileno())
+
+def restore_terminal(saved: Optional[list]) -> None:
+    """Undo whatever an interrupted prompt thread left behind on the terminal.
+
+    A pick menu cancelled with Ctrl-C never reaches its curses.wrapper cleanup,
+    since the picker thread is simply abandoned, leaving echo and canonical
+    mode off on the user's shell.
+    """
+    curses = sys.modules.get('curses')
+    if curses is not None:
+        try:
+            # Only while a menu is still open, a finished pick already ended
+            # curses and a second endwin() would move the cursor again
+            if not curses.isendwin():
+                curses.endwin()  # leave the alternate screen
+        except curses.error:  # curses was never initialised
+            pass
+    if saved is not None:
+        termios.tcsetattr(sys.stdin.fileno(), termios.TCSADRAIN, saved)
+
+async def ainput(prompt: str) -> str:
+    return await run_in_thread(input, prompt)
+
+async def apick(*args, **kwargs):
+    from pick import pick
+    return await run_in_thread(pick, *args, **kwargs)
+
+def validate_email_address(value: str) -> str:
+    """Return the normalized email, rejecting obvious typos before email_validator runs."""
+    if not EMAIL_RE.match(value):
+        raise ValueError("Malformed email address")
+    from email_validator import validate_email
+    return validate_email(value, check_deliverability=False).email
+
+async def validate_user_input(prompt: str, validation_func) -> Any:
     while True:
         try:
-            value = input(prompt)
+            value = await ainput(prompt)
             return validation_func(value)
         except Exception as e:
             console.print(f"[red]{e}[/red]")
     
-async def get_user_info(email: str) -> Dict[str, str]:
-    """Fetch user info from Freshservice using email - tries both requesters and agents endpoints"""
-    async with aiohttp.ClientSession() as session:
-        # First try requesters endpoint
-        requester_url = f"{BASE_URL}/requesters?email={quote(email)}"
-        agent_url = f"{BASE_URL}/agents?email={quote(email)}"
-        
-        logging.debug(f"Attempting requester lookup with URL: {requester_url}")
-        
-        try:
-            # Try requesters endpoint first
-            auth = aiohttp.BasicAuth(API_KEY, 'X')
-            headers = {
-                "Content-Type": "application/json",
-                "Accept": "application/json"
-            }
-
-            data = await make_request(session, 'GET', requester_url, headers=headers)
-            logging.debug(f"Requester lookup response: {json.dumps(data, indent=2)}")
-
-            if data and isinstance(data, dict) and 'requesters' in data and data['requesters']:
-                user = data['requesters'][0]
-                return {
-                    'first_name': user.get('first_name', ''),
-                    'last_name': user.get('last_name', ''),
-                    'email': email,
-                    'id': user.get('id')
-                }
-
-            # If no requester found, try agents endpoint
-            logging.debug(f"No requester found, trying agents endpoint: {agent_url}")
-            data = await make_request(session, 'GET', agent_url, headers=headers)
-            logging.debug(f"Agent lookup response: {json.dumps(data, indent=2)}")
+async def get_user_info(session: aiohttp.ClientSession, email: str, use_cache: bool = True) -> Dict[str, str]:
+    """Fetch user info from Freshservice using email, remembering hits on disk"""
+    cache_path = os.path.join(CACHE_DIR, f"{FRESHSERVICE_DOMAIN}_users.json")
+    users = read_cache(cache_path)
+    if not isinstance(users, dict):
+        users = {}
+    if use_cache and email in users:
+        logging.debug(f"Using cached user info for {email}")
+        return users[email]
+
+    user_info = await lookup_user(session, email)
+    if user_info:
+        users[email] = user_info
+        write_cache(cache_path, users)
+    return user_info
+
+async def lookup_user(session: aiohttp.ClientSession, email: str) -> Dict[str, str]:
+    """Look up a user by email - tries both requesters and agents endpoints"""
+    requester_url = f"{BASE_URL}/requesters?email={quote(email)}"
+    agent_url = f"{BASE_URL}/agents?email={quote(email)}"
+    
+    logging.debug(f"Looking up user with URLs: {requester_url}, {agent_url}")
+    
+    # Query both endpoints at once, requesters still win when both match
+    results = await asyncio.gather(
+        make_request(session, 'GET', requester_url),
+        make_request(session, 'GET', agent_url),
+        return_exceptions=True
+    )
 
-            if data and isinstance(data, dict) and 'agents' in data and data['agents']:
-                user = data['agents'][0]
+    try:
+        for key, data in zip(('requesters', 'agents'), results):
+            if isinstance(data, BaseException):
+                raise data
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                logging.debug(f"{key.capitalize()} lookup response: {orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()}")
+
+            if data and isinstance(data, dict) and key in data and data[key]:
+                user = data[key][0]
                 return {
                     'first_name': user.get('first_name', ''),
                     'last_name': user.get('last_name', ''),
@@ -270,19 +526,15 @@ async def get_user_info(email: str) -> Dict[str, str]:
                     'id': user.get('id')
                 }
 
-            console.print(f"[yellow]Warning: No user found for email {email} in either requesters or agents[/yellow]")
-            return None
+        console.print(f"[yellow]Warning: No user found for email {email} in either requesters or agents[/yellow]")
+        return None
 
-        except Exception as e:
-            logging.error(f"Error fetching user info: {str(e)}")
-            console.print(f"[red]Error looking up user: {str(e)}[/red]")
-            return None
-    
-    console.print(f"[yellow]Warning: No user found for email {email}[/yellow]")
-    logging.error(f"Failed to find user with email {email} after trying multiple endpoints")
-    return None
+    except Exception as e:
+        logging.error(f"Error fetching user info: {str(e)}")
+        console.print(f"[red]Error looking up user: {str(e)}[/red]")
+        return None
 
-async def main_async():
+async def main_async(use_cache: bool = True):
     try:
         # Verify configuration
         if not FRESHSERVICE_DOMAIN.endswith('freshservice.com'):
@@ -291,77 +543,83 @@ async def main_async():
         if len(API_KEY) < 10:
             raise APIError("API key appears to be invalid or too short")
 
-        # Get user email and info
-        email = validate_user_input("Enter requester's email address: ", lambda x: validate_email(x).email)
-        user_info = await get_user_info(email)
-        
-        if not user_info:
-            console.print("[red]Unable to find user in Freshservice. Please verify the email address.[/red]")
-            sys.exit(1)
+        progress = ProgressDisplay()
+        async with create_session() as session:
+            # Workspaces and ticket fields depend on nothing the user enters, so
+            # fetch them concurrently while the email and description are typed
+            workspaces_task = asyncio.create_task(get_workspaces(session))
+            fields_task = asyncio.create_task(fetch_ticket_fields(session, use_cache))
+
+            # Get user email and start the lookup while the description is typed
+            email = await validate_user_input("Enter requester's email address: ", validate_email_address)
+            user_info_task = asyncio.create_task(get_user_info(session, email, use_cache))
+
+            description = (await ainput("Enter ticket description: ")).strip()
+
+            user_info = await user_info_task
+            if not user_info:
+                console.print("[red]Unable to find user in Freshservice. Please verify the email address.[/red]")
+                sys.exit(1)
             
-        first_name = user_info['first_name']
-        last_name = user_info['last_name']
+            first_name = user_info['first_name']
+            last_name = user_info['last_name']
         
-        console.print(f"[green]Creating ticket for: {first_name} {last_name} ({email})[/green]")
+            console.print(f"[green]Creating ticket for: {first_name} {last_name} ({email})[/green]")
 
-        description = input("Enter ticket description: ").strip()
+            # Spinner only while still waiting, never during the prompts above
+            with progress.spinner("Fetching workspaces and ticket fields..."):
+                workspaces, ticket_fields = await asyncio.gather(workspaces_task, fields_task)
+            if not workspaces:
+                console.print("[red]No workspaces found![/red]")
+                sys.exit(1)
 
-        workspaces = await get_workspaces()
-        if not workspaces:
-            console.print("[red]No workspaces found![/red]")
-            sys.exit(1)
+            workspace_options = [f"{ws.name} (ID: {ws.id})" for ws in workspaces]
+            workspace_selection, _ = await apick(workspace_options, "Select workspace:")
+            selected_workspace_id = int(workspace_selection.split(" (ID: ")[-1].rstrip(")"))
 
-        workspace_options = [f"{ws.name} (ID: {ws.id})" for ws in workspaces]
-        workspace_selection, _ = pick(workspace_options, "Select workspace:")
-        selected_workspace_id = int(workspace_selection.split(" (ID: ")[-1].rstrip(")"))
-
-        with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}")) as progress:
-            progress.add_task(description="Fetching and updating category choices...", total=None)
-            ticket_fields = await fetch_ticket_fields()
             choices_data = extract_choices(ticket_fields)
             with open('choices_structure.json', 'w') as f:
                 json.dump(choices_data, f, indent=4)
             logging.debug("Choices structure saved to 'choices_structure.json'.")
 
-        category_structure = build_category_structure(choices_data)
-
-        category_path = traverse_category(category_structure)
-        if not category_path:
-            console.print("[red]No category selected![/red]")
-            sys.exit(1)
-        logging.debug(f"Selected category path: {category_path}")
-
-        priority_options = ["Low", "Medium", "High", "Urgent"]
-        priority_selection, _ = pick(priority_options, "Select priority:")
-        priority = priority_options.index(priority_selection) + 1
-
-        attachments = []
-        if input("Do you want to attach files? (y/N): ").strip().lower() == 'y':
-            console.print("[yellow]Please enter file paths separated by commas, without quotes.[/yellow]")
-            file_paths = input("Enter file paths separated by commas: ").split(',')
-            attachments = [path.strip() for path in file_paths]
-
-        result = await create_ticket_async(
-            first_name=first_name, 
-            last_name=last_name, 
-            email=email, 
-            description=description,
-            category=category_path['category_name'],
-            sub_category=category_path.get('sub_category_name', ''),
-            item_category=category_path.get('item_category_name', ''),
-            priority=priority,
-            workspace_id=selected_workspace_id,
-            attachments=attachments
-        )
-
-        if "ticket" in result:
-            console.print(f"[green]Ticket created successfully! Ticket ID: {result['ticket']['id']}[/green]")
-        else:
-            console.print(f"[red]Error creating ticket: {result}[/red]")
+            category_index = build_category_index(choices_data)
+
+            category_path = await traverse_category(category_index)
+            if not category_path:
+                console.print("[red]No category selected![/red]")
+                sys.exit(1)
+            logging.debug(f"Selected category path: {category_path}")
+
+            priority_options = ["Low", "Medium", "High", "Urgent"]
+            priority_selection, _ = await apick(priority_options, "Select priority:")
+            priority = priority_options.index(priority_selection) + 1
+
+            attachments = []
+            if (await ainput("Do you want to attach files? (y/N): ")).strip().lower() == 'y':
+                console.print("[yellow]Please enter file paths separated by commas, without quotes.[/yellow]")
+                file_paths = (await ainput("Enter file paths separated by commas: ")).split(',')
+                attachments = [path.strip() for path in file_paths]
+
+            result = await create_ticket_async(
+                session,
+                progress,
+                first_name=first_name, 
+                last_name=last_name, 
+                email=email, 
+                description=description,
+                category=category_path['category_name'],
+                sub_category=category_path.get('sub_category_name', ''),
+                item_category=category_path.get('item_category_name', ''),
+                priority=priority,
+                workspace_id=selected_workspace_id,
+                attachments=attachments
+            )
+
+            if "ticket" in result:
+                console.print(f"[green]Ticket created successfully! Ticket ID: {result['ticket']['id']}[/green]")
+            else:
+                console.print(f"[red]Error creating ticket: {result}[/red]")
 
-    except KeyboardInterrupt:
-        console.print("\n[red]Operation cancelled by user.[/red]")
-        sys.exit(0)
     except APIError as e:
         console.print(f"[red]API Error: {str(e)}[/red]")
         logging.error(f"API Error: {str(e)}")
@@ -372,7 +630,24 @@ async def main_async():
         sys.exit(1)
 
 def main():
-    asyncio.run(main_async())
+    parser = argparse.ArgumentParser(description="Create a Freshservice ticket.")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="ignore cached ticket fields and user lookups and refresh them from the API"
+    )
+    args = parser.parse_args()
+
+    run = uvloop.run if uvloop is not None else asyncio.run
+    saved_terminal = save_terminal()
+    try:
+        run(main_async(use_cache=not args.no_cache))
+    except KeyboardInterrupt:
+        # Ctrl-C cancels main_async while a prompt thread is still waiting on
+        # stdin, so this is the only place the cancellation surfaces
+        restore_terminal(saved_terminal)
+        console.print("\n[red]Operation cancelled by user.[/red]")
+        sys.exit(0)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file